@@ -9,16 +9,16 @@ from nodes import (
     CombineTutorial
 )
 
-def create_tutorial_flow():
+def create_tutorial_flow(use_cache=True, durable=False):
     """Creates and returns the codebase tutorial generation flow."""
 
     # Instantiate nodes
-    fetch_repo = FetchRepo()
+    fetch_repo = FetchRepo(use_cache=use_cache)
     identify_abstractions = IdentifyAbstractions(max_retries=3, wait=10)
     analyze_relationships = AnalyzeRelationships(max_retries=3, wait=10)
     order_chapters = OrderChapters(max_retries=3, wait=10)
     write_chapters = WriteChapters(max_retries=3, wait=10) # This is a BatchNode
-    combine_tutorial = CombineTutorial()
+    combine_tutorial = CombineTutorial(durable=durable)
 
     # Connect nodes in sequence based on the design
     fetch_repo >> identify_abstractions
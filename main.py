@@ -34,6 +34,8 @@ def main():
     parser.add_argument("-i", "--include", nargs="+", help="Include file patterns (e.g. '*.py' '*.js'). Defaults to common code files if not specified.")
     parser.add_argument("-e", "--exclude", nargs="+", help="Exclude file patterns (e.g. 'tests/*' 'docs/*'). Defaults to test/build directories if not specified.")
     parser.add_argument("-s", "--max-size", type=int, default=100000, help="Maximum file size in bytes (default: 100000, about 100KB).")
+    parser.add_argument("--no-cache", action="store_true", help="Always re-crawl the repository instead of reusing a recent crawl from .cache/.")
+    parser.add_argument("--durable", action="store_true", help="fsync the generated tutorial files and directory before exiting.")
 
     args = parser.parse_args()
 
@@ -69,7 +71,7 @@ def main():
     print(f"Starting tutorial generation for: {args.repo or args.dir}")
 
     # Create the flow instance
-    tutorial_flow = create_tutorial_flow()
+    tutorial_flow = create_tutorial_flow(use_cache=not args.no_cache, durable=args.durable)
 
     # Run the flow
     tutorial_flow.run(shared)
@@ -1,10 +1,97 @@
 import os
+import re
 import yaml
 import fnmatch
+import json
+import time
+import hashlib
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from pocketflow import Node, BatchNode
+try:
+    from yaml import CSafeLoader as SafeLoader # libyaml-backed, much faster
+except ImportError:
+    from yaml import SafeLoader
 from utils.crawl_github_files import crawl_github_files
 from utils.call_llm import call_llm # Assuming you have this utility
 
+def _scan(directory, skip_dir=None):
+    """
+    Yield a DirEntry for every file under directory, recursing like os.walk.
+
+    Uses os.scandir so file type and stat data come from the directory listing
+    instead of separate syscalls. Symlinked directories are not followed, and
+    directories for which skip_dir(path) is true are not descended into.
+    """
+    stack = [directory]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                subdirs = []
+                for entry in it:
+                    if entry.is_dir():
+                        if not entry.is_symlink() and not (skip_dir and skip_dir(entry.path)):
+                            subdirs.append(entry.path)
+                    else:
+                        yield entry
+        except OSError:
+            continue
+        # Reverse so directories are visited in listing order
+        stack.extend(reversed(subdirs))
+
+@functools.lru_cache(maxsize=32)
+def _compile_patterns(patterns):
+    """
+    Compile a frozenset of fnmatch patterns into one regex matching any of them.
+    Returns None for an empty set.
+    """
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{fnmatch.translate(os.path.normcase(p))})" for p in patterns))
+
+def _dir_exclude_patterns(exclude_patterns):
+    """
+    Derive patterns that exclude whole directories from file exclude patterns.
+
+    If a directory matches `foo*` then every file below it matches `foo*` too, and
+    if it matches `foo` every file below it matches `foo/*`, so such directories
+    can be pruned from the walk without changing the result.
+    """
+    dir_patterns = set()
+    for pattern in exclude_patterns:
+        if pattern.endswith('*'):
+            dir_patterns.add(pattern)
+        if pattern.endswith('/*'):
+            dir_patterns.add(pattern[:-2])
+    return frozenset(dir_patterns)
+
+def _read_file(filepath, size=None):
+    """Read a UTF-8 text file, returning None (with a warning) if it can't be read."""
+    try:
+        # Unbuffered: one whole-file read needs no BufferedReader
+        with open(filepath, 'rb', buffering=0) as f:
+            if size is None:
+                size = os.fstat(f.fileno()).st_size
+            # Read into a buffer presized from stat, so it never has to grow
+            data = bytearray(size)
+            filled = 0
+            with memoryview(data) as view:
+                while filled < size:
+                    n = f.readinto(view[filled:])
+                    if not n:
+                        break
+                    filled += n
+            del data[filled:] # File shrank since it was stat'ed
+            data += f.read() # or grew
+        content = data.decode('utf-8')
+    except Exception as e:
+        print(f"Warning: Could not read file {filepath}: {e}")
+        return None
+    # Match text-mode universal newlines
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
 def crawl_local_files(directory, include_patterns=None, exclude_patterns=None, max_file_size=None, use_relative_paths=True):
     """
     Crawl files in a local directory with similar interface as crawl_github_files.
@@ -17,78 +104,173 @@ def crawl_local_files(directory, include_patterns=None, exclude_patterns=None, m
         use_relative_paths (bool): Whether to use paths relative to directory
         
     Returns:
-        dict: {"files": {filepath: content}}
+        list: [(filepath, content), ...] in walk order
     """
     if not os.path.isdir(directory):
         raise ValueError(f"Directory does not exist: {directory}")
         
-    files_dict = {}
+    include_re = _compile_patterns(frozenset(include_patterns or ()))
+    exclude_re = _compile_patterns(frozenset(exclude_patterns or ()))
+    
+    # Skip excluded directories (e.g. node_modules/*) instead of filtering their files
+    prune_re = _compile_patterns(_dir_exclude_patterns(exclude_patterns or ()))
+    skip_dir = None
+    if prune_re is not None:
+        def skip_dir(path):
+            dirpath = os.path.relpath(path, directory) if use_relative_paths else path
+            return prune_re.match(os.path.normcase(dirpath)) is not None
     
-    for root, _, files in os.walk(directory):
-        for filename in files:
-            filepath = os.path.join(root, filename)
+    # Walk and filter first, then read the surviving files concurrently
+    candidates = [] # (relpath, filepath, size)
+    for entry in _scan(directory, skip_dir):
+        filepath = entry.path
+        
+        # Get path relative to directory if requested
+        if use_relative_paths:
+            relpath = os.path.relpath(filepath, directory)
+        else:
+            relpath = filepath
+        matchpath = os.path.normcase(relpath)
             
-            # Get path relative to directory if requested
-            if use_relative_paths:
-                relpath = os.path.relpath(filepath, directory)
-            else:
-                relpath = filepath
-                
-            # Check if file matches any include pattern
-            included = False
-            if include_patterns:
-                for pattern in include_patterns:
-                    if fnmatch.fnmatch(relpath, pattern):
-                        included = True
-                        break
-            else:
-                included = True
-                
-            # Check if file matches any exclude pattern
-            excluded = False
-            if exclude_patterns:
-                for pattern in exclude_patterns:
-                    if fnmatch.fnmatch(relpath, pattern):
-                        excluded = True
-                        break
-                        
-            if not included or excluded:
+        # Cheapest, most selective gates first: excludes usually catch noise like .git/*
+        if exclude_re is not None and exclude_re.match(matchpath):
+            continue
+            
+        if include_re is not None and not include_re.match(matchpath):
+            continue
+            
+        # Check file size last, since on POSIX the first stat() is a syscall
+        # (DirEntry caches it; on Windows it comes free with the listing)
+        size = None # Read sizes the buffer with fstat if we didn't stat here
+        if max_file_size:
+            try:
+                size = entry.stat().st_size
+            except OSError as e: # e.g. a dangling symlink
+                print(f"Warning: Could not stat file {filepath}: {e}")
                 continue
-                
-            # Check file size
-            if max_file_size and os.path.getsize(filepath) > max_file_size:
+            if size > max_file_size:
                 continue
-                
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                files_dict[relpath] = content
-            except Exception as e:
-                print(f"Warning: Could not read file {filepath}: {e}")
-                
-    return {"files": files_dict}
+            
+        candidates.append((relpath, filepath, size))
+    
+    # Reads are I/O bound, so overlap them; map() keeps the walk order
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        contents = executor.map(
+            _read_file,
+            [filepath for _, filepath, _ in candidates],
+            [size for _, _, size in candidates]
+        )
+        return [
+            (relpath, content)
+            for (relpath, _, _), content in zip(candidates, contents)
+            if content is not None
+        ]
 
 # Helper to create context from files, respecting limits (basic example)
 def create_llm_context(files_data):
-    context = ""
+    parts = [] # Joined once at the end to keep concatenation linear
     file_info = [] # Store tuples of (index, path)
     for i, (path, content) in enumerate(files_data):
-        entry = f"--- File Index {i}: {path} ---\n{content}\n\n"
-        context += entry
+        parts.append(f"--- File Index {i}: {path} ---\n{content}\n\n")
         file_info.append((i, path))
 
-    return context, file_info # file_info is list of (index, path)
+    return "".join(parts), file_info # file_info is list of (index, path)
 
 # Helper to get content for specific file indices
 def get_content_for_indices(files_data, indices):
-    content_map = {}
-    for i in indices:
-        if 0 <= i < len(files_data):
-            path, content = files_data[i]
-            content_map[f"{i} # {path}"] = content # Use index + path as key for context
-    return content_map
+    # Values reference the strings in files_data, so file contents are never copied
+    num_files = len(files_data)
+    return {
+        f"{i} # {files_data[i][0]}": files_data[i][1] # Use index + path as key for context
+        for i in indices
+        if 0 <= i < num_files
+    }
+
+# Maps every non-alphanumeric ASCII character to '_' for chapter filenames
+_SAFE_TABLE = {i: '_' for i in range(128) if not chr(i).isalnum()}
+
+# Helper to turn a chapter name into a filename-safe string
+# (cached: WriteChapters and CombineTutorial sanitize the same names)
+@functools.lru_cache(maxsize=256)
+def _safe_name(name):
+    if name.isascii():
+        return name.translate(_SAFE_TABLE).lower()
+    # str.isalnum is Unicode-aware, so keep the per-character rule for other names
+    return "".join(c if c.isalnum() else '_' for c in name).lower()
+
+# Body of the first ```yaml fenced block (an unclosed fence runs to the end)
+_YAML_BLOCK = re.compile(r"```yaml(.*?)(?:```|$)", re.DOTALL)
+
+# Helper to pull the YAML payload out of an LLM response
+def extract_yaml(response):
+    m = _YAML_BLOCK.search(response)
+    # Fall back to the whole response if the LLM skipped the code fence
+    return m.group(1).strip() if m else response.strip()
+
+# Leading integer of an `idx # comment` entry
+_IDX_RE = re.compile(r"\s*([-+]?\d+)\s*(?:#|$)")
+
+# Helper to parse an `idx # comment` entry and check it is in [0, max_idx)
+def _parse_idx(entry, max_idx, ctx):
+    try:
+        if isinstance(entry, int):
+            idx = entry
+        else:
+            m = _IDX_RE.match(str(entry))
+            idx = int(m.group(1)) if m else int(str(entry).strip())
+    except (ValueError, TypeError):
+        raise ValueError(f"Could not parse index from entry: {entry} {ctx}")
+    if not (0 <= idx < max_idx):
+        raise ValueError(f"Invalid index {idx} {ctx}. Max index is {max_idx - 1}.")
+    return idx
+
+# GitHub crawls are cached on disk so re-runs within the TTL skip the download
+FETCH_CACHE_DIR = ".cache"
+FETCH_CACHE_TTL = 3600 # seconds
+
+# Helper to get the cache file for a crawl, keyed on everything that affects its result
+def get_fetch_cache_path(prep_res):
+    key = repr((
+        prep_res["repo_url"],
+        sorted(prep_res["include_patterns"] or []),
+        sorted(prep_res["exclude_patterns"] or []),
+        prep_res["max_file_size"],
+        prep_res["use_relative_paths"],
+    ))
+    return os.path.join(FETCH_CACHE_DIR, f"fetch_{hashlib.sha1(key.encode()).hexdigest()}.json")
+
+# Helper to load a cached crawl, returning None if it is missing, expired or unreadable
+def load_fetch_cache(cache_path):
+    try:
+        if time.time() - os.path.getmtime(cache_path) > FETCH_CACHE_TTL:
+            return None
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # Anything other than a list of [path, content] pairs is treated as a miss
+    if not isinstance(data, list) or not all(
+        isinstance(item, list) and len(item) == 2 and all(isinstance(v, str) for v in item)
+        for item in data
+    ):
+        return None
+    return [tuple(item) for item in data]
+
+# Helper to save a crawl for later runs
+def save_fetch_cache(cache_path, files_list):
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(files_list, f)
+    except OSError as e:
+        print(f"Warning: Could not write fetch cache {cache_path}: {e}")
 
 class FetchRepo(Node):
+    def __init__(self, use_cache=True, **kwargs):
+        super().__init__(**kwargs)
+        self.use_cache = use_cache
+
     def prep(self, shared):
         repo_url = shared.get("repo_url")
         local_dir = shared.get("local_dir")
@@ -119,18 +301,31 @@ class FetchRepo(Node):
 
     def exec(self, prep_res):
         if prep_res["repo_url"]:
-            print(f"Crawling repository: {prep_res['repo_url']}...")
-            result = crawl_github_files(
-                repo_url=prep_res["repo_url"],
-                token=prep_res["token"],
-                include_patterns=prep_res["include_patterns"],
-                exclude_patterns=prep_res["exclude_patterns"],
-                max_file_size=prep_res["max_file_size"],
-                use_relative_paths=prep_res["use_relative_paths"]
-            )
+            # Never persist crawls made with a token: they may contain private code
+            cache_path = None
+            if self.use_cache and not prep_res["token"]:
+                cache_path = get_fetch_cache_path(prep_res)
+            files_list = load_fetch_cache(cache_path) if cache_path else None
+            if files_list is not None:
+                print(f"Using cached crawl of {prep_res['repo_url']} from {cache_path}")
+            else:
+                print(f"Crawling repository: {prep_res['repo_url']}...")
+                result = crawl_github_files(
+                    repo_url=prep_res["repo_url"],
+                    token=prep_res["token"],
+                    include_patterns=prep_res["include_patterns"],
+                    exclude_patterns=prep_res["exclude_patterns"],
+                    max_file_size=prep_res["max_file_size"],
+                    use_relative_paths=prep_res["use_relative_paths"]
+                )
+                # Convert dict to list of tuples: [(path, content), ...]
+                files_list = list(result.get("files", {}).items())
+                if cache_path and files_list: # Don't cache failed or empty crawls
+                    save_fetch_cache(cache_path, files_list)
         else:
             print(f"Crawling directory: {prep_res['local_dir']}...")
-            result = crawl_local_files(
+            # Already a list of (path, content) tuples
+            files_list = crawl_local_files(
                 directory=prep_res["local_dir"],
                 include_patterns=prep_res["include_patterns"],
                 exclude_patterns=prep_res["exclude_patterns"],
@@ -138,8 +333,6 @@ class FetchRepo(Node):
                 use_relative_paths=prep_res["use_relative_paths"]
             )
             
-        # Convert dict to list of tuples: [(path, content), ...]
-        files_list = list(result.get("files", {}).items())
         print(f"Fetched {len(files_list)} files.")
         return files_list
 
@@ -195,8 +388,8 @@ Format the output as a YAML list of dictionaries:
         response = call_llm(prompt)
 
         # --- Validation ---
-        yaml_str = response.strip().split("```yaml")[1].split("```")[0].strip()
-        abstractions = yaml.safe_load(yaml_str)
+        yaml_str = extract_yaml(response)
+        abstractions = yaml.load(yaml_str, Loader=SafeLoader)
 
         if not isinstance(abstractions, list):
             raise ValueError("LLM Output is not a list")
@@ -210,29 +403,14 @@ Format the output as a YAML list of dictionaries:
             if not isinstance(item["file_indices"], list):
                  raise ValueError(f"file_indices is not a list in item: {item}")
 
-            # Validate indices
-            validated_indices = []
-            for idx_entry in item["file_indices"]:
-                 try:
-                     if isinstance(idx_entry, int):
-                         idx = idx_entry
-                     elif isinstance(idx_entry, str) and '#' in idx_entry:
-                          idx = int(idx_entry.split('#')[0].strip())
-                     else:
-                          idx = int(str(idx_entry).strip())
-
-                     if not (0 <= idx < file_count):
-                         raise ValueError(f"Invalid file index {idx} found in item {item['name']}. Max index is {file_count - 1}.")
-                     validated_indices.append(idx)
-                 except (ValueError, TypeError):
-                      raise ValueError(f"Could not parse index from entry: {idx_entry} in item {item['name']}")
-
-            item["files"] = sorted(list(set(validated_indices)))
-            # Store only the required fields
+            # Validate indices, deduplicate and sort in one pass; store only the required fields
             validated_abstractions.append({
                 "name": item["name"],
                 "description": item["description"],
-                "files": item["files"]
+                "files": sorted({
+                    _parse_idx(idx_entry, file_count, f"in item {item['name']}")
+                    for idx_entry in item["file_indices"]
+                })
             })
 
         print(f"Identified {len(validated_abstractions)} abstractions.")
@@ -248,18 +426,18 @@ class AnalyzeRelationships(Node):
         project_name = shared["project_name"]  # Get project name
 
         # Create context with abstraction names, indices, descriptions, and relevant file snippets
-        context = "Identified Abstractions:\n"
+        context_parts = ["Identified Abstractions:\n"]
         all_relevant_indices = set()
         abstraction_info_for_prompt = []
         for i, abstr in enumerate(abstractions):
             # Use 'files' which contains indices directly
             file_indices_str = ", ".join(map(str, abstr['files']))
             info_line = f"- Index {i}: {abstr['name']} (Relevant file indices: [{file_indices_str}])\n  Description: {abstr['description']}"
-            context += info_line + "\n"
+            context_parts.append(info_line + "\n")
             abstraction_info_for_prompt.append(f"{i} # {abstr['name']}")
             all_relevant_indices.update(abstr['files'])
 
-        context += "\nRelevant File Snippets (Referenced by Index and Path):\n"
+        context_parts.append("\nRelevant File Snippets (Referenced by Index and Path):\n")
         # Get content for relevant files using helper
         relevant_files_content_map = get_content_for_indices(
             files_data,
@@ -270,7 +448,8 @@ class AnalyzeRelationships(Node):
             f"--- File: {idx_path} ---\n{content}"
             for idx_path, content in relevant_files_content_map.items()
         )
-        context += file_context_str
+        context_parts.append(file_context_str)
+        context = "".join(context_parts)
 
         return context, "\n".join(abstraction_info_for_prompt), project_name  # Return project name
 
@@ -318,8 +497,8 @@ Now, provide the YAML output:
         response = call_llm(prompt)
 
         # --- Validation ---
-        yaml_str = response.strip().split("```yaml")[1].split("```")[0].strip()
-        relationships_data = yaml.safe_load(yaml_str)
+        yaml_str = extract_yaml(response)
+        relationships_data = yaml.load(yaml_str, Loader=SafeLoader)
 
         if not isinstance(relationships_data, dict) or not all(k in relationships_data for k in ["summary", "relationships"]):
             raise ValueError("LLM output is not a dict or missing keys ('summary', 'relationships')")
@@ -340,18 +519,13 @@ Now, provide the YAML output:
                   raise ValueError(f"Relationship label is not a string: {rel}")
 
              # Validate indices
-             try:
-                 from_idx = int(str(rel["from_abstraction"]).split('#')[0].strip())
-                 to_idx = int(str(rel["to_abstraction"]).split('#')[0].strip())
-                 if not (0 <= from_idx < num_abstractions and 0 <= to_idx < num_abstractions):
-                      raise ValueError(f"Invalid index in relationship: from={from_idx}, to={to_idx}. Max index is {num_abstractions-1}.")
-                 validated_relationships.append({
-                     "from": from_idx,
-                     "to": to_idx,
-                     "label": rel["label"] 
-                 })
-             except (ValueError, TypeError):
-                  raise ValueError(f"Could not parse indices from relationship: {rel}")
+             from_idx = _parse_idx(rel["from_abstraction"], num_abstractions, f"in relationship {rel}")
+             to_idx = _parse_idx(rel["to_abstraction"], num_abstractions, f"in relationship {rel}")
+             validated_relationships.append({
+                 "from": from_idx,
+                 "to": to_idx,
+                 "label": rel["label"] 
+             })
 
         print("Generated project summary and relationship details.")
         return {
@@ -376,13 +550,16 @@ class OrderChapters(Node):
             abstraction_info_for_prompt.append(f"- {i} # {a['name']}")
         abstraction_listing = "\n".join(abstraction_info_for_prompt)
 
-        context = f"Project Summary:\n{relationships['summary']}\n\n"
-        context += "Relationships (Indices refer to abstractions above):\n"
+        context_parts = [
+            f"Project Summary:\n{relationships['summary']}\n\n",
+            "Relationships (Indices refer to abstractions above):\n",
+        ]
         for rel in relationships['details']:
              from_name = abstractions[rel['from']]['name']
              to_name = abstractions[rel['to']]['name']
              # Use 'label' instead of 'desc'
-             context += f"- From {rel['from']} ({from_name}) to {rel['to']} ({to_name}): {rel['label']}\n"
+             context_parts.append(f"- From {rel['from']} ({from_name}) to {rel['to']} ({to_name}): {rel['label']}\n")
+        context = "".join(context_parts)
 
         return abstraction_listing, context, len(abstractions), project_name
 
@@ -416,8 +593,8 @@ Now, provide the YAML output:
 
         # --- Validation ---
         # Rely on Node's built-in retry/fallback
-        yaml_str = response.strip().split("```yaml")[1].split("```")[0].strip()
-        ordered_indices_raw = yaml.safe_load(yaml_str)
+        yaml_str = extract_yaml(response)
+        ordered_indices_raw = yaml.load(yaml_str, Loader=SafeLoader)
 
         if not isinstance(ordered_indices_raw, list):
             raise ValueError("LLM output is not a list")
@@ -425,23 +602,11 @@ Now, provide the YAML output:
         ordered_indices = []
         seen_indices = set()
         for entry in ordered_indices_raw:
-            try:
-                 if isinstance(entry, int):
-                     idx = entry
-                 elif isinstance(entry, str) and '#' in entry:
-                      idx = int(entry.split('#')[0].strip())
-                 else:
-                      idx = int(str(entry).strip())
-
-                 if not (0 <= idx < num_abstractions):
-                      raise ValueError(f"Invalid index {idx} in ordered list. Max index is {num_abstractions-1}.")
-                 if idx in seen_indices:
-                     raise ValueError(f"Duplicate index {idx} found in ordered list.")
-                 ordered_indices.append(idx)
-                 seen_indices.add(idx)
-
-            except (ValueError, TypeError):
-                 raise ValueError(f"Could not parse index from ordered list entry: {entry}")
+            idx = _parse_idx(entry, num_abstractions, "in ordered list")
+            if idx in seen_indices:
+                raise ValueError(f"Duplicate index {idx} found in ordered list.")
+            ordered_indices.append(idx)
+            seen_indices.add(idx)
 
         # Check if all abstractions are included
         if len(ordered_indices) != num_abstractions:
@@ -455,6 +620,10 @@ Now, provide the YAML output:
         shared["chapter_order"] = exec_res # List of indices
 
 class WriteChapters(BatchNode):
+    def __init__(self, max_workers=8, **kwargs):
+        super().__init__(**kwargs)
+        self.max_workers = max_workers # Chapters written concurrently (LLM calls block on network)
+
     def prep(self, shared):
         chapter_order = shared["chapter_order"] # List of indices
         abstractions = shared["abstractions"]   # List of dicts, now using 'files' with indices
@@ -462,25 +631,27 @@ class WriteChapters(BatchNode):
         # Get already written chapters to provide context
         # We store them temporarily during the batch run, not in shared memory yet
         # The 'previous_chapters_summary' will be built progressively in the exec context
-        self.chapters_written_so_far = [] # Use instance variable for temporary storage across exec calls
+        self.chapter_futures = [] # Future per item, in item order, filled in by _exec
 
         # Create a complete list of all chapters
         all_chapters = []
-        chapter_filenames = {} # Store chapter filename mapping for linking
+        chapter_meta = [None] * len(chapter_order) # Chapter info by position, None if invalid
         for i, abstraction_index in enumerate(chapter_order):
             if 0 <= abstraction_index < len(abstractions):
                 chapter_num = i + 1
                 chapter_name = abstractions[abstraction_index]["name"]
                 # Create safe filename
-                safe_name = "".join(c if c.isalnum() else '_' for c in chapter_name).lower()
-                filename = f"{i+1:02d}_{safe_name}.md"
+                filename = f"{i+1:02d}_{_safe_name(chapter_name)}.md"
                 # Format with link
                 all_chapters.append(f"{chapter_num}. [{chapter_name}]({filename})")
-                # Store mapping of chapter index to filename for linking
-                chapter_filenames[abstraction_index] = {"num": chapter_num, "name": chapter_name, "filename": filename}
+                chapter_meta[i] = {"num": chapter_num, "name": chapter_name, "filename": filename}
         
         # Create a formatted string with all chapters
         full_chapter_listing = "\n".join(all_chapters)
+        # Map abstraction index to filename for linking
+        chapter_filenames = {
+            chapter_order[i]: meta["filename"] for i, meta in enumerate(chapter_meta) if meta
+        }
 
         items_to_process = []
         for i, abstraction_index in enumerate(chapter_order):
@@ -490,27 +661,25 @@ class WriteChapters(BatchNode):
                 related_file_indices = abstraction_details.get("files", [])
                 # Get content using helper, passing indices
                 related_files_content_map = get_content_for_indices(files_data, related_file_indices)
+                # Prepare file context string from the map
+                file_context_str = "\n\n".join(
+                    f"--- File: {idx_path.split('# ')[1] if '# ' in idx_path else idx_path} ---\n{content}"
+                    for idx_path, content in related_files_content_map.items()
+                )
                 
-                # Get previous chapter info for transitions
-                prev_chapter = None
-                if i > 0:
-                    prev_idx = chapter_order[i-1]
-                    prev_chapter = chapter_filenames[prev_idx]
-                
-                # Get next chapter info for transitions
-                next_chapter = None
-                if i < len(chapter_order) - 1:
-                    next_idx = chapter_order[i+1]
-                    next_chapter = chapter_filenames[next_idx]
+                # Get previous and next chapter info for transitions
+                prev_chapter = chapter_meta[i-1] if i > 0 else None
+                next_chapter = chapter_meta[i+1] if i < len(chapter_order) - 1 else None
 
                 items_to_process.append({
+                    "position": len(items_to_process), # Index into chapter_futures (skipped entries have none)
                     "chapter_num": i + 1,
                     "abstraction_index": abstraction_index,
                     "abstraction_details": abstraction_details,
-                    "related_files_content_map": related_files_content_map,
+                    "file_context_str": file_context_str,  # Pre-joined related file snippets
                     "project_name": shared["project_name"],  # Add project name
                     "full_chapter_listing": full_chapter_listing,  # Add the full chapter listing
-                    "chapter_filenames": chapter_filenames,  # Add chapter filenames mapping
+                    "chapter_filenames": chapter_filenames,  # Add abstraction index -> filename mapping
                     "prev_chapter": prev_chapter,  # Add previous chapter info
                     "next_chapter": next_chapter,  # Add next chapter info
                     # previous_chapters_summary will be added dynamically in exec
@@ -528,16 +697,21 @@ class WriteChapters(BatchNode):
         project_name = item.get("project_name")  # Get from item
         print(f"Writing chapter {chapter_num} for: {abstraction_name} using LLM...")
 
-        # Prepare file context string from the map
-        file_context_str = "\n\n".join(
-            f"--- File: {idx_path.split('# ')[1] if '# ' in idx_path else idx_path} ---\n{content}"
-            for idx_path, content in item["related_files_content_map"].items()
-        )
-
-        # Get summary of chapters written *before* this one
-        # Use the temporary instance variable
-        previous_chapters_summary = "\n---\n".join(self.chapters_written_so_far)
-
+        file_context_str = item["file_context_str"]
+
+        # Get summary of chapters written *before* this one: exactly the items at
+        # positions 0..position-max_workers, so the prompt (and its LLM cache key) doesn't
+        # depend on thread timing. Items run in submission order and at most max_workers-1
+        # others run alongside this one, so those have all started and can't wait on it.
+        # With max_workers=1 this is every previous chapter.
+        position = item["position"]
+        earlier_futures = self.chapter_futures[:max(0, position + 1 - self.max_workers)]
+        previous_chapters_summary = "\n---\n".join(f.result() for f in earlier_futures)
+        if not previous_chapters_summary:
+            previous_chapters_summary = (
+                "This is the first chapter." if position == 0
+                else "The previous chapters are being written in parallel; use the Complete Tutorial Structure above to refer to them."
+            )
 
         prompt = f"""
 Write a very beginner-friendly tutorial chapter (in Markdown format) for the project `{project_name}` about the concept: "{abstraction_name}". This is Chapter {chapter_num}.
@@ -550,7 +724,7 @@ Complete Tutorial Structure:
 {item["full_chapter_listing"]}
 
 Context from previous chapters (summary):
-{previous_chapters_summary if previous_chapters_summary else "This is the first chapter."}
+{previous_chapters_summary}
 
 Relevant Code Snippets:
 {file_context_str if file_context_str else "No specific code snippets provided for this abstraction."}
@@ -599,19 +773,101 @@ Now, directly provide a super beginner-friendly Markdown output (DON'T need ```m
              else: # Otherwise, prepend it
                  chapter_content = f"{actual_heading}\n\n{chapter_content}"
 
-        # Add the generated content to our temporary list for the next iteration's context
-        self.chapters_written_so_far.append(chapter_content)
-
         return chapter_content # Return the Markdown string
 
+    def _exec(self, items):
+        # Submit in item order, recording each future before the next item is
+        # submitted so later chapters can wait on it for their context
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for item in items or []:
+                self.chapter_futures.append(executor.submit(self._exec_item, item))
+            try:
+                return [future.result() for future in self.chapter_futures]
+            except Exception:
+                # Stop at the first failed chapter, like the sequential loop did,
+                # instead of paying for the queued ones
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+
+    def _exec_item(self, item):
+        # Same retry/fallback as Node._exec, but with a local retry counter,
+        # since self.cur_retry would be shared between worker threads
+        for retry in range(self.max_retries):
+            try:
+                return self.exec(item)
+            except Exception as e:
+                if retry == self.max_retries - 1:
+                    return self.exec_fallback(item, e)
+                if self.wait > 0:
+                    time.sleep(self.wait)
+
     def post(self, shared, prep_res, exec_res_list):
         # exec_res_list contains the generated Markdown for each chapter, in order
         shared["chapters"] = exec_res_list
-        # Clean up the temporary instance variable
-        del self.chapters_written_so_far
+        # Clean up the temporary instance variables
+        del self.chapter_futures
         print(f"Finished writing {len(exec_res_list)} chapters.")
 
+# Footer appended to index.md and every chapter
+ATTRIBUTION = "---\n\nGenerated by [AI Codebase Knowledge Builder](https://github.com/The-Pocket/Tutorial-Codebase-Knowledge)"
+_ATTRIBUTION_BYTES = ATTRIBUTION.encode("utf-8")
+
+# Drops quotes and flattens line breaks in mermaid edge labels in a single pass
+_EDGE_LABEL_TABLE = str.maketrans({'"': None, '\n': ' ', '\r': ' '})
+MAX_LABEL_LEN = 30 # Keep edge labels short for readability
+_ELLIPSIS = "..."
+_LABEL_HEAD = MAX_LABEL_LEN - len(_ELLIPSIS) # Characters kept before the ellipsis
+
+# Helper to encode generated markdown once, validating it is representable as UTF-8
+def encode_markdown(text, source):
+    try:
+        return text.encode("utf-8", errors="strict")
+    except UnicodeEncodeError as e:
+        # e.g. lone surrogates in LLM output; replace them rather than fail the write
+        print(f"Warning: {source} is not valid UTF-8 ({e}). Replacing invalid characters.")
+        return text.encode("utf-8", errors="replace")
+
+# Helper to sanitize a relationship label for a mermaid edge, shortening it for readability
+def _edge_label(label):
+    label = label.translate(_EDGE_LABEL_TABLE)
+    return label if len(label) <= MAX_LABEL_LEN else label[:_LABEL_HEAD] + _ELLIPSIS
+
+# Flags for writing output files; O_BINARY only exists (and matters) on Windows
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+# Helper to write one already-encoded output file, skipping the text I/O layer
+def write_file(path, data):
+    # The payload is a single buffer, so write it straight to the fd instead of
+    # copying it through a BufferedWriter
+    fd = os.open(path, _WRITE_FLAGS, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    return path
+
+# Helper to write an output file from a list of encoded parts without joining them first
+def write_file_parts(path, parts):
+    with open(path, "wb", buffering=1 << 20) as f:
+        f.writelines(parts)
+    return path
+
+# Helper to flush a written file (or, on POSIX, a directory entry) to stable storage
+def fsync_path(path, flags=os.O_RDONLY):
+    fd = os.open(path, flags)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    return path
+
 class CombineTutorial(Node):
+    def __init__(self, durable=False, **kwargs):
+        super().__init__(**kwargs)
+        self.durable = durable # fsync output files once all writes are issued; off lets the OS write back lazily
+
     def prep(self, shared):
         project_name = shared["project_name"]
         output_base_dir = shared.get("output_dir", "output") # Default output dir
@@ -634,86 +890,93 @@ class CombineTutorial(Node):
             node_label = sanitized_name # Using sanitized name only, no index
             mermaid_lines.append(f'    {node_id}["{node_label}"]')
         # Add edges for relationships using 'label'
-        for rel in relationships_data['details']:
-            from_node_id = f"A{rel['from']}"
-            to_node_id = f"A{rel['to']}"
-            # Sanitize 'label' for edge label
-            edge_label = rel['label'].replace('"', '').replace('\n', ' ') # Basic sanitization
-            # Limit edge label length for readability (optional, but good for diagrams)
-            max_label_len = 30 # Make it shorter for labels
-            if len(edge_label) > max_label_len:
-                edge_label = edge_label[:max_label_len-3] + "..."
-            mermaid_lines.append(f'    {from_node_id} -- "{edge_label}" --> {to_node_id}')
-
-        mermaid_diagram = "\n".join(mermaid_lines)
+        mermaid_lines.extend([
+            f'    A{rel["from"]} -- "{_edge_label(rel["label"])}" --> A{rel["to"]}'
+            for rel in relationships_data['details']
+        ])
         # --- End Mermaid ---
 
 
-        # Prepare index.md content
-        index_content = f"# Tutorial: {project_name}\n\n"
-        index_content += f"{relationships_data['summary']}\n\n"
-        index_content += f"**Source Repository:** [{repo_url}]({repo_url})\n\n"
-
-        # Add Mermaid diagram for relationships
-        index_content += "```mermaid\n"
-        index_content += mermaid_diagram + "\n"
-        index_content += "```\n\n"
-
-        index_content += "## Chapters\n\n"
+        # Prepare index.md content as a list of parts, joined once at the end
+        index_parts = [
+            f"# Tutorial: {project_name}\n\n",
+            f"{relationships_data['summary']}\n\n",
+            f"**Source Repository:** [{repo_url}]({repo_url})\n\n",
+            # Add Mermaid diagram for relationships
+            "```mermaid\n",
+        ]
+        # Lines go straight into the parts list; no joined diagram string is built
+        index_parts.extend(line + "\n" for line in mermaid_lines)
+        index_parts.append("```\n\n")
+        index_parts.append("## Chapters\n\n")
 
         chapter_files = []
+        # Zero-padded chapter number prefixes ("01_", "02_", ...) for ordering filenames
+        prefixes = [f"{n:02d}_" for n in range(1, len(chapter_order) + 1)]
+        num_abstractions = len(abstractions)
+        num_chapters = len(chapters_content)
+        # Local bindings for the per-chapter calls below
+        append_index_part = index_parts.append
+        append_chapter_file = chapter_files.append
+        safe_name = _safe_name
         # Generate chapter links based on the determined order
         for i, abstraction_index in enumerate(chapter_order):
             # Ensure index is valid and we have content for it
-            if 0 <= abstraction_index < len(abstractions) and i < len(chapters_content):
+            if 0 <= abstraction_index < num_abstractions and i < num_chapters:
                 abstraction_name = abstractions[abstraction_index]["name"]
-                # Sanitize name for filename
-                safe_name = "".join(c if c.isalnum() else '_' for c in abstraction_name).lower()
-                # Use chapter number (i+1) for ordering filename
-                filename = f"{i+1:02d}_{safe_name}.md"
-                index_content += f"{i+1}. [{abstraction_name}]({filename})\n"
+                # Sanitize name for filename (same helper as WriteChapters, so links match)
+                filename = prefixes[i] + safe_name(abstraction_name) + ".md"
+                append_index_part(f"{i+1}. [{abstraction_name}]({filename})\n")
                 
-                # Add attribution to chapter content
-                chapter_content = chapters_content[i]
-                if not chapter_content.endswith("\n\n"):
-                    chapter_content += "\n\n"
-                chapter_content += "---\n\nGenerated by [AI Codebase Knowledge Builder](https://github.com/The-Pocket/Tutorial-Codebase-Knowledge)"
+                # Encode once and add attribution to chapter content as bytes
+                body = encode_markdown(chapters_content[i], f"Chapter {i+1}")
+                pad = b"" if body.endswith(b"\n\n") else b"\n\n"
                 
-                # Store filename and corresponding content
-                chapter_files.append({"filename": filename, "content": chapter_content})
+                # Store filename and corresponding content, assembled in a single allocation
+                append_chapter_file({"filename": filename, "content_bytes": b"".join((body, pad, _ATTRIBUTION_BYTES))})
             else:
                  print(f"Warning: Mismatch between chapter order, abstractions, or content at index {i} (abstraction index {abstraction_index}). Skipping file generation for this entry.")
 
         # Add attribution to index content
-        index_content += "\n\n---\n\nGenerated by [AI Codebase Knowledge Builder](https://github.com/The-Pocket/Tutorial-Codebase-Knowledge)"
+        index_parts.append("\n\n" + ATTRIBUTION)
 
         return {
             "output_path": output_path,
-            "index_content": index_content,
-            "chapter_files": chapter_files # List of {"filename": str, "content": str}
+            # Encoded once here so exec retries reuse the bytes; written part by part, never joined
+            "index_parts": [encode_markdown(part, "index.md") for part in index_parts],
+            "chapter_files": chapter_files # List of {"filename": str, "content_bytes": bytes}
         }
 
     def exec(self, prep_res):
         output_path = prep_res["output_path"]
-        index_content = prep_res["index_content"]
+        index_parts = prep_res["index_parts"]
         chapter_files = prep_res["chapter_files"]
 
         print(f"Combining tutorial into directory: {output_path}")
         # Rely on Node's built-in retry/fallback
         os.makedirs(output_path, exist_ok=True)
 
-        # Write index.md
-        index_filepath = os.path.join(output_path, "index.md")
-        with open(index_filepath, "w", encoding="utf-8") as f:
-            f.write(index_content)
-        print(f"  - Wrote {index_filepath}")
-
-        # Write chapter files
-        for chapter_info in chapter_files:
-            chapter_filepath = os.path.join(output_path, chapter_info["filename"])
-            with open(chapter_filepath, "w", encoding="utf-8") as f:
-                f.write(chapter_info["content"])
-            print(f"  - Wrote {chapter_filepath}")
+        # Write index.md and chapter files concurrently, since each write is latency-bound
+        # Directory prefix with a trailing separator, joined once for all files
+        prefix = os.path.join(output_path, "")
+        index_filepath = prefix + "index.md"
+        with ThreadPoolExecutor(max_workers=min(16, len(chapter_files) + 1)) as executor:
+            futures = [executor.submit(write_file_parts, index_filepath, index_parts)] + [
+                executor.submit(write_file, prefix + chapter_info["filename"], chapter_info["content_bytes"])
+                for chapter_info in chapter_files
+            ]
+            # result() re-raises any write error
+            written = [future.result() for future in futures]
+            if self.durable:
+                # Flush only after every write has been issued, so writeback is batched
+                # (Windows needs a writable handle to flush a file)
+                flush_flags = os.O_RDWR if os.name == "nt" else os.O_RDONLY
+                list(executor.map(fsync_path, written, [flush_flags] * len(written)))
+        if self.durable and os.name != "nt":
+            # One fsync on the directory commits all the new entries together
+            fsync_path(output_path)
+        # Report once from this thread, in order, instead of a print per file
+        print("  - Wrote " + "\n  - Wrote ".join(written))
 
         return output_path # Return the final path
 
@@ -2,6 +2,7 @@ from google import genai
 import os
 import logging
 import json
+import threading
 from datetime import datetime
 
 # Configure logging
@@ -19,6 +20,8 @@ logger.addHandler(file_handler)
 
 # Simple cache configuration
 cache_file = "llm_cache.json"
+# Serializes cache file access when nodes call the LLM from several threads
+cache_lock = threading.Lock()
 
 # By default, we Google Gemini 2.5 pro, as it shows great performance for code understanding
 def call_llm(prompt: str, use_cache: bool = True) -> str:
@@ -29,12 +32,13 @@ def call_llm(prompt: str, use_cache: bool = True) -> str:
     if use_cache:
         # Load cache from disk
         cache = {}
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, 'r') as f:
-                    cache = json.load(f)
-            except:
-                logger.warning(f"Failed to load cache, starting with empty cache")
+        with cache_lock:
+            if os.path.exists(cache_file):
+                try:
+                    with open(cache_file, 'r') as f:
+                        cache = json.load(f)
+                except:
+                    logger.warning(f"Failed to load cache, starting with empty cache")
         
         # Return from cache if exists
         if prompt in cache:
@@ -64,22 +68,23 @@ def call_llm(prompt: str, use_cache: bool = True) -> str:
     
     # Update cache if enabled
     if use_cache:
-        # Load cache again to avoid overwrites
-        cache = {}
-        if os.path.exists(cache_file):
+        with cache_lock:
+            # Load cache again to avoid overwrites
+            cache = {}
+            if os.path.exists(cache_file):
+                try:
+                    with open(cache_file, 'r') as f:
+                        cache = json.load(f)
+                except:
+                    pass
+            
+            # Add to cache and save
+            cache[prompt] = response_text
             try:
-                with open(cache_file, 'r') as f:
-                    cache = json.load(f)
-            except:
-                pass
-        
-        # Add to cache and save
-        cache[prompt] = response_text
-        try:
-            with open(cache_file, 'w') as f:
-                json.dump(cache, f)
-        except Exception as e:
-            logger.error(f"Failed to save cache: {e}")
+                with open(cache_file, 'w') as f:
+                    json.dump(cache, f)
+            except Exception as e:
+                logger.error(f"Failed to save cache: {e}")
     
     return response_text
 
@@ -4,10 +4,21 @@ import os
 import tempfile
 import git
 import time
+import re
 import fnmatch
+import functools
 from typing import Union, Set, List, Dict, Tuple, Any
 from urllib.parse import urlparse
 
+@functools.lru_cache(maxsize=1024)
+def _compiled(pattern: str):
+    """Translate and compile an fnmatch pattern once, reused across crawls and retries."""
+    return re.compile(fnmatch.translate(os.path.normcase(pattern)))
+
+def _fnmatch(name: str, pattern: str) -> bool:
+    """Equivalent to fnmatch.fnmatch, using the cached compiled pattern."""
+    return _compiled(pattern).match(os.path.normcase(name)) is not None
+
 def crawl_github_files(
     repo_url, 
     token=None, 
@@ -49,12 +60,12 @@ def crawl_github_files(
             include_file = True
         else:
             # Check if file matches any include pattern
-            include_file = any(fnmatch.fnmatch(file_name, pattern) for pattern in include_patterns)
+            include_file = any(_fnmatch(file_name, pattern) for pattern in include_patterns)
 
         # If exclude patterns are specified, check if file should be excluded
         if exclude_patterns and include_file:
             # Exclude if file matches any exclude pattern
-            exclude_file = any(fnmatch.fnmatch(file_path, pattern) for pattern in exclude_patterns)
+            exclude_file = any(_fnmatch(file_path, pattern) for pattern in exclude_patterns)
             return not exclude_file
 
         return include_file
@@ -162,12 +173,12 @@ def crawl_github_files(
             include_file = True
         else:
             # Check if file matches any include pattern
-            include_file = any(fnmatch.fnmatch(file_name, pattern) for pattern in include_patterns)
+            include_file = any(_fnmatch(file_name, pattern) for pattern in include_patterns)
         
         # If exclude patterns are specified, check if file should be excluded
         if exclude_patterns and include_file:
             # Exclude if file matches any exclude pattern
-            exclude_file = any(fnmatch.fnmatch(file_path, pattern) for pattern in exclude_patterns)
+            exclude_file = any(_fnmatch(file_path, pattern) for pattern in exclude_patterns)
             return not exclude_file
         
         return include_file